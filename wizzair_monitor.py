@@ -2,23 +2,48 @@
 # -*- coding: utf-8 -*-
 import os
 import json
+import math
 import time
+import asyncio
+import httpx
 import requests
 import logging
 import random
 import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # необязательно: разбирает ответ farechart в 2–3 раза быстрее json
+except ImportError:
+    orjson = None
 
 # === Настройки ===
 CHECK_INTERVAL_MINUTES = 60      # интервал между циклами мониторинга
-ROUTE_DELAY_SECONDS = 5          # пауза между разными маршрутами
+ROUTE_DELAY_SECONDS = 2          # начальная пауза между маршрутами в одном потоке
+MIN_ROUTE_DELAY_SECONDS = 1      # пауза сокращается после успешных запросов, но не ниже этого
+MAX_ROUTE_DELAY_SECONDS = 30     # и растёт после 429/503, но не выше этого
+MAX_RETRY_AFTER_SECONDS = 120    # ждём столько, сколько просит Retry-After, но не дольше этого
+CONCURRENT_REQUESTS = 4          # сколько маршрутов проверяется одновременно
+FARECHART_TIMEOUT_SECONDS = 30   # общий лимит на один запрос farechart
+# Кэш цен срабатывает, только если CHECK_INTERVAL_MINUTES меньше PRICE_CACHE_TTL_SECONDS
+# (при интервале 60 минут каждый цикл делает новые запросы) — см. README, «Интервал проверки и кэш цен».
+PRICE_CACHE_TTL_SECONDS = 600    # сколько хранить найденную цену маршрута
+PRICE_CACHE_FAIL_TTL_SECONDS = 60  # сколько не повторять запрос после неудачи
 SAME_ROUTE_DELAY_MINUTES = 1    # пауза между одинаковыми маршрутами (в минутах)
 BASE_DIR = Path(__file__).resolve().parent
 ROUTES_FILE = BASE_DIR / "routes.json"
 PREV_PRICES_FILE = BASE_DIR / "prev_prices.json"
 AIRPORTS_FILE = BASE_DIR / "airports.json"  # Файл с кодами аэропортов
 BUILD_NUMBER_URL = "https://www.wizzair.com/buildnumber"
+# Версия API в ответе buildnumber (например, "SSR https://be.wizzair.com/27.36.0"); ищем по байтам
+BUILD_NUMBER_RE = re.compile(rb"https://be\.wizzair\.com/(\d+\.\d+\.\d+)")
+TELEGRAM_MESSAGE_LIMIT = 4000    # Telegram принимает до 4096 символов в одном сообщении
+TELEGRAM_SEPARATOR = "\n\n━━━━━\n\n"
 
 # === Telegram ===
 load_dotenv(BASE_DIR / ".env")
@@ -41,25 +66,91 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
 ]
 
+# Статические заголовки для be.wizzair.com, задаются один раз на httpx-клиент в main_loop;
+# по HTTP/2 повторяющиеся заголовки сжимаются HPACK
+WIZZAIR_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "Origin": "https://wizzair.com",
+    "Referer": "https://wizzair.com/",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Неизменяемая часть тела запроса farechart; маршрут и число взрослых подставляются при вызове
+FARECHART_PAYLOAD_TEMPLATE = {
+    "isRescueFare": False,
+    "childCount": 0,
+    "dayInterval": 7,
+    "wdc": False,
+    "isFlightChange": False,
+}
+
+# === HTTP-сессии ===
+# Синхронная сессия для buildnumber: соединение переиспользуется (keep-alive) между циклами.
+SESSION = requests.Session()
+_wizzair_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        raise_on_status=False,
+    ),
+)
+SESSION.mount("http://", _wizzair_adapter)
+SESSION.mount("https://", _wizzair_adapter)
+
+# Отдельная сессия для api.telegram.org; POST sendMessage не повторяем, чтобы не дублировать сообщения
+TELEGRAM_SESSION = requests.Session()
+_telegram_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=Retry(total=3, backoff_factor=0.5))
+TELEGRAM_SESSION.mount("https://", _telegram_adapter)
+
 # === Глобальная переменная для версии API ===
 API_VERSION = "27.36.0"  # Версия по умолчанию
 
-def load_airports():
-    """Загружает коды аэропортов из файла."""
-    if AIRPORTS_FILE.exists():
+# === Адаптивная пауза между запросами к farechart ===
+CURRENT_ROUTE_DELAY = ROUTE_DELAY_SECONDS
+RATE_LIMITED_UNTIL = 0.0  # до этого момента (time.monotonic()) новые запросы к farechart не отправляются
+
+# === Кэш цен: "origin-destination-depart_date" → (expires_at по time.monotonic(), (price, currency) или None) ===
+PRICE_CACHE: dict[str, tuple[float, tuple | None]] = {}
+
+# === Кэш JSON-файлов: перечитываются только при изменении st_mtime_ns ===
+_routes_cache = {"mtime": 0, "data": None}
+_airports_cache = {"mtime": 0, "data": {}}
+
+def load_json_cached(path: Path, cache: dict, default):
+    """Возвращает содержимое JSON-файла, перечитывая его только если файл изменился.
+
+    Если файл не удаётся разобрать, остаются прежние данные.
+    """
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        cache["mtime"] = 0
+        cache["data"] = default
+        return default
+    if mtime != cache["mtime"]:
+        cache["mtime"] = mtime
         try:
-            with AIRPORTS_FILE.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            with path.open("r", encoding="utf-8") as f:
+                cache["data"] = json.load(f)
         except Exception as e:
-            logging.error(f"Ошибка загрузки {AIRPORTS_FILE}: {e}")
-            return {}
-    return {}
+            logging.error(f"Ошибка загрузки {path}: {e}")
+    return cache["data"]
+
+def load_routes():
+    """Загружает маршруты из файла (None, если файла нет или он ни разу не был разобран)."""
+    return load_json_cached(ROUTES_FILE, _routes_cache, None)
 
-AIRPORT_CODES = load_airports()  # Загружаем коды аэропортов при старте
+def load_airports():
+    """Загружает коды аэропортов из файла."""
+    return load_json_cached(AIRPORTS_FILE, _airports_cache, {})
 
-def get_city_name_with_code(airport_code: str) -> str:
-    """Возвращает строку 'Название города (код аэропорта)'."""
-    city_name = AIRPORT_CODES.get(airport_code, airport_code)
+def get_city_name_with_code(airport_code: str, airports: dict) -> str:
+    """Возвращает строку 'Название города (код аэропорта)' по справочнику из load_airports()."""
+    city_name = airports.get(airport_code, airport_code)
     if city_name == airport_code:  # Если название не найдено, возвращаем только код
         return city_name
     return f"{city_name} ({airport_code})"
@@ -71,12 +162,13 @@ def get_current_api_version():
         headers = {
             "User-Agent": random.choice(USER_AGENTS),
         }
-        resp = requests.get(BUILD_NUMBER_URL, headers=headers, timeout=10)
+        resp = SESSION.get(BUILD_NUMBER_URL, headers=headers, timeout=10)
         resp.raise_for_status()
-        # Извлекаем версию API из ответа (например, "SSR https://be.wizzair.com/27.36.0")
-        match = re.search(r"https://be\.wizzair\.com/(\d+\.\d+\.\d+)", resp.text)
+        # Ответ — одна короткая строка, поэтому ищем по всему телу ответа (в байтах):
+        # при чтении по частям номер версии мог обрезаться на границе части
+        match = BUILD_NUMBER_RE.search(resp.content)
         if match:
-            new_version = match.group(1)
+            new_version = match.group(1).decode("ascii")
             if new_version != API_VERSION:
                 logging.info(f"🔄 Обновлена версия API: {API_VERSION} → {new_version}")
                 API_VERSION = new_version
@@ -91,11 +183,29 @@ def send_telegram(msg: str):
     """Отправляет сообщение в Telegram."""
     try:
         url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-        requests.post(url, json={"chat_id": CHAT_ID, "text": msg, "parse_mode": "HTML"}, timeout=10)
+        TELEGRAM_SESSION.post(url, json={"chat_id": CHAT_ID, "text": msg, "parse_mode": "HTML"}, timeout=10)
         logging.info("✅ Сообщение отправлено в Telegram")
     except Exception as e:
         logging.error(f"Ошибка Telegram: {e}")
 
+def split_messages(msgs: list[str], limit: int = TELEGRAM_MESSAGE_LIMIT) -> list[str]:
+    """Объединяет сообщения через TELEGRAM_SEPARATOR в части не длиннее limit символов."""
+    chunks = []
+    current = []
+    current_len = 0
+    for msg in msgs:
+        added_len = len(msg) + (len(TELEGRAM_SEPARATOR) if current else 0)
+        if current and current_len + added_len > limit:
+            chunks.append(TELEGRAM_SEPARATOR.join(current))
+            current = []
+            current_len = 0
+            added_len = len(msg)
+        current.append(msg)
+        current_len += added_len
+    if current:
+        chunks.append(TELEGRAM_SEPARATOR.join(current))
+    return chunks
+
 def format_price(price: float, currency: str) -> str:
     """Форматирует цену в зависимости от валюты."""
     if currency == "RON":
@@ -106,15 +216,72 @@ def format_price(price: float, currency: str) -> str:
     else:
         return f"{price:.2f} {currency}"
 
-def check_route_price(origin: str, destination: str, depart_date: str, adults: int = 1):
-    """Проверяет цену для одного маршрута."""
+class RateLimited:
+    """Результат запроса, получившего 429/503: повторять не раньше, чем через retry_after секунд."""
+
+    def __init__(self, retry_after: float | None):
+        self.retry_after = retry_after
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Возвращает задержку в секундах из заголовка Retry-After (число секунд или HTTP-дата)."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def prune_price_cache(route_ids):
+    """Удаляет из PRICE_CACHE просроченные записи и маршруты, которых больше нет в routes.json."""
+    now = time.monotonic()
+    for key in list(PRICE_CACHE):
+        if key not in route_ids or PRICE_CACHE[key][0] <= now:
+            del PRICE_CACHE[key]
+
+def get_cached_price(cache_key: str):
+    """Возвращает актуальную запись PRICE_CACHE (expires_at, результат) или None."""
+    cached = PRICE_CACHE.get(cache_key)
+    if cached and time.monotonic() < cached[0]:
+        return cached
+    return None
+
+async def check_route_price(client: httpx.AsyncClient, route: dict):
+    """Запрашивает цену маршрута и сохраняет результат в PRICE_CACHE.
+
+    Возвращает то же, что fetch_route_price. Кэш читает check_routes до запроса.
+    """
+    got_2xx, result = await fetch_route_price(
+        client,
+        origin=route["origin"],
+        destination=route["destination"],
+        depart_date=route["depart_date"],
+        adults=route.get("adults", 1)
+    )
+    if isinstance(result, RateLimited):
+        return got_2xx, result  # не кэшируем: check_routes повторит запрос после паузы
+    ttl = PRICE_CACHE_TTL_SECONDS if result is not None else PRICE_CACHE_FAIL_TTL_SECONDS
+    PRICE_CACHE[get_route_id(route)] = (time.monotonic() + ttl, result)
+    return got_2xx, result
+
+async def fetch_route_price(client: httpx.AsyncClient, origin: str, destination: str,
+                            depart_date: str, adults: int = 1):
+    """Запрашивает цену для одного маршрута у API WizzAir.
+
+    Возвращает пару (ответ 2xx?, результат), где результат — (price, currency),
+    None, если цены нет или запрос не удался, либо RateLimited при 429/503.
+    """
     payload = {
-        "isRescueFare": False,
+        **FARECHART_PAYLOAD_TEMPLATE,
         "adultCount": adults,
-        "childCount": 0,
-        "dayInterval": 7,
-        "wdc": False,
-        "isFlightChange": False,
         "flightList": [{
             "departureStation": origin,
             "arrivalStation": destination,
@@ -122,50 +289,58 @@ def check_route_price(origin: str, destination: str, depart_date: str, adults: i
         }],
     }
 
+    # Остальные заголовки (WIZZAIR_HEADERS) уже заданы на клиенте
     headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
         "User-Agent": random.choice(USER_AGENTS),
-        "Origin": "https://wizzair.com",
-        "Referer": "https://wizzair.com/",
-        "Accept-Language": "en-US,en;q=0.9",
     }
 
     try:
-        with requests.Session() as session:
-            resp = session.post(
+        # timeout клиента httpx действует на каждую фазу (connect/read/...) отдельно,
+        # поэтому общий лимит на запрос задаём через wait_for
+        resp = await asyncio.wait_for(
+            client.post(
                 f"https://be.wizzair.com/{API_VERSION}/Api/asset/farechart",
                 headers=headers,
-                data=json.dumps(payload),
-                timeout=30
-            )
-            resp.raise_for_status()
-            data = resp.json()
+                json=payload,
+            ),
+            FARECHART_TIMEOUT_SECONDS,
+        )
+        if resp.status_code in (429, 503):
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            logging.warning(f"API ограничивает запросы для {origin} → {destination}: {resp.status_code}, "
+                            f"Retry-After: {retry_after}")
+            return False, RateLimited(retry_after)
+        if resp.status_code >= 400:
+            logging.error(f"HTTP ошибка для {origin} → {destination}: {resp.status_code} {resp.text}")
+            return False, None
+        data = orjson.loads(resp.content) if orjson else resp.json()
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            # Сериализация всего ответа дорогая, поэтому только при включённом DEBUG
             logging.debug(f"Ответ API для {origin} → {destination}: {json.dumps(data, indent=2)}")
 
-            # Ищем цену для нужной даты
-            target_date = f"{depart_date}T00:00:00"
-            outbound_flights = data.get("outboundFlights", [])
-            for flight in outbound_flights:
-                if flight.get("date") == target_date:
-                    if flight.get("priceType") == "price":
-                        price = flight.get("price", {}).get("amount")
-                        currency = flight.get("price", {}).get("currencyCode")
-                        if price and currency:
-                            logging.debug(f"Найдена цена для {target_date}: {price} {currency}")
-                            return price, currency
-                    else:
-                        logging.error(f"Для {target_date} нет доступной цены (priceType: {flight.get('priceType')})")
-                        return None
-
-            logging.error(f"Не найдена цена для {target_date}")
-            return None
-    except requests.exceptions.HTTPError as e:
-        logging.error(f"HTTP ошибка для {origin} → {destination}: {e.response.status_code} {e.response.text}")
-        return None
+        # Ищем цену для нужной даты
+        target_date = f"{depart_date}T00:00:00"
+        outbound_flights = data.get("outboundFlights", [])
+        for flight in outbound_flights:
+            if flight.get("date") == target_date:
+                if flight.get("priceType") == "price":
+                    price = flight.get("price", {}).get("amount")
+                    currency = flight.get("price", {}).get("currencyCode")
+                    if price and currency:
+                        logging.debug(f"Найдена цена для {target_date}: {price} {currency}")
+                        return True, (price, currency)
+                else:
+                    logging.error(f"Для {target_date} нет доступной цены (priceType: {flight.get('priceType')})")
+                    return True, None
+
+        logging.error(f"Не найдена цена для {target_date}")
+        return True, None
+    except asyncio.TimeoutError:
+        logging.error(f"Таймаут {FARECHART_TIMEOUT_SECONDS} с при запросе цены для {origin} → {destination}")
+        return False, None
     except Exception as e:
         logging.error(f"Ошибка при запросе цены для {origin} → {destination}: {e}")
-        return None
+        return False, None
 
 def load_prev_prices():
     """Загружает предыдущие цены из файла."""
@@ -178,85 +353,170 @@ def load_prev_prices():
     return {}
 
 def save_prev_prices(data):
-    """Сохраняет текущие цены в файл."""
+    """Сохраняет текущие цены в файл.
+
+    Пишет во временный файл и заменяет им старый через os.replace,
+    чтобы при падении посреди записи не остался обрезанный JSON.
+    """
+    tmp_file = PREV_PRICES_FILE.with_suffix(".tmp")
     try:
-        with PREV_PRICES_FILE.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_file, PREV_PRICES_FILE)
     except Exception as e:
         logging.error(f"Ошибка записи {PREV_PRICES_FILE}: {e}")
+        try:
+            tmp_file.unlink(missing_ok=True)  # не оставляем недописанный файл рядом с настоящим
+        except OSError:
+            pass
 
 def get_route_id(route: dict):
     """Возвращает уникальный ID маршрута."""
     return f"{route['origin']}-{route['destination']}-{route['depart_date']}"
 
-def main_loop():
-    """Основной цикл мониторинга."""
-    logging.info("🚀 Старт мониторинга маршрутов Wizzair")
-    while True:
-        # Обновляем версию API перед каждым циклом
-        get_current_api_version()
-        logging.info(f"🔄 Используется версия API: {API_VERSION}")
-
-        if not ROUTES_FILE.exists():
-            logging.error(f"Файл {ROUTES_FILE} не найден")
-            time.sleep(CHECK_INTERVAL_MINUTES * 60)
-            continue
-
-        with ROUTES_FILE.open("r", encoding="utf-8") as f:
-            routes = json.load(f)
-
-        prev_prices = load_prev_prices()
-        cur_prices = prev_prices.copy()
-        any_changes = False
-
-        for idx, route in enumerate(routes, start=1):
-            route_id = get_route_id(route)
-            origin_city = get_city_name_with_code(route["origin"])
-            destination_city = get_city_name_with_code(route["destination"])
+async def check_routes(client: httpx.AsyncClient, routes: list, airports: dict):
+    """Проверяет цены всех маршрутов параллельно, не более CONCURRENT_REQUESTS одновременно.
+
+    Результаты возвращаются в том же порядке, что и маршруты.
+    """
+    semaphore = asyncio.Semaphore(CONCURRENT_REQUESTS)
+
+    async def bounded(idx: int, route: dict):
+        global CURRENT_ROUTE_DELAY, RATE_LIMITED_UNTIL
+        route_id = get_route_id(route)
+        origin_city = get_city_name_with_code(route["origin"], airports)
+        destination_city = get_city_name_with_code(route["destination"], airports)
+        cached = get_cached_price(route_id)  # единственная проверка кэша перед запросом
+        if cached:
+            # Запрос не нужен, поэтому ни пауз, ни изменения CURRENT_ROUTE_DELAY
+            logging.info(f"🕑 Маршрут {idx}/{len(routes)}: {origin_city} → {destination_city} ({route_id}) — из кэша")
+            return cached[1]
+
+        async with semaphore:
+            await asyncio.sleep(random.uniform(0.5, 1.5))  # джиттер, чтобы запросы не уходили пачкой
             logging.info(f"🕑 Проверка маршрута {idx}/{len(routes)}: {origin_city} → {destination_city} ({route_id})")
-
-            result = check_route_price(
-                origin=route["origin"],
-                destination=route["destination"],
-                depart_date=route["depart_date"],
-                adults=route.get("adults", 1)
+            # После 429/503 маршрут повторяется один раз, когда истечёт пауза
+            for _ in range(2):
+                # Если API недавно ответило 429/503, ждём вместе со всеми потоками
+                wait = RATE_LIMITED_UNTIL - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                got_2xx, result = await check_route_price(client, route)
+                if not isinstance(result, RateLimited):
+                    break
+                CURRENT_ROUTE_DELAY = min(MAX_ROUTE_DELAY_SECONDS, CURRENT_ROUTE_DELAY * 1.5)
+                pause = result.retry_after if result.retry_after is not None else CURRENT_ROUTE_DELAY
+                pause = min(pause, MAX_RETRY_AFTER_SECONDS)
+                RATE_LIMITED_UNTIL = max(RATE_LIMITED_UNTIL, time.monotonic() + pause)
+                logging.info(f"⏸ Пауза {pause:.1f} с, интервал между запросами {CURRENT_ROUTE_DELAY:.1f} с")
+            else:
+                result = None  # и повторный запрос получил 429/503
+            # Ответ 2xx без цены на дату (например, всё продано) — тоже успешный запрос
+            if got_2xx:
+                CURRENT_ROUTE_DELAY = max(MIN_ROUTE_DELAY_SECONDS, CURRENT_ROUTE_DELAY * 0.9)
+            await asyncio.sleep(CURRENT_ROUTE_DELAY)
+            return result
+
+    return await asyncio.gather(*(bounded(idx, route) for idx, route in enumerate(routes, start=1)))
+
+async def run_cycle(client: httpx.AsyncClient):
+    """Один цикл мониторинга: проверка всех маршрутов и отправка уведомлений."""
+    # Обновляем версию API перед каждым циклом
+    await asyncio.to_thread(get_current_api_version)
+    logging.info(f"🔄 Используется версия API: {API_VERSION}")
+
+    routes = load_routes()
+    if routes is None:
+        if ROUTES_FILE.exists():
+            logging.error(f"Файл {ROUTES_FILE} содержит некорректный JSON")
+        else:
+            logging.error(f"Файл {ROUTES_FILE} не найден")
+        return
+    airports = load_airports()  # один раз за цикл, а не на каждое название города
+
+    prev_prices = load_prev_prices()
+    cur_prices = prev_prices.copy()
+    any_changes = False
+    pending_msgs = []
+
+    # Маршруты с одинаковыми origin-destination-depart_date (например, с разным adults)
+    # запрашиваем один раз: цена в farechart от числа пассажиров не зависит
+    unique_routes = {}
+    for route in routes:
+        unique_routes.setdefault(get_route_id(route), route)
+    if len(unique_routes) < len(routes):
+        logging.info(f"🔁 Повторяющихся маршрутов: {len(routes) - len(unique_routes)}, запросов будет {len(unique_routes)}")
+    prune_price_cache(unique_routes)
+    results = dict(zip(unique_routes, await check_routes(client, list(unique_routes.values()), airports)))
+
+    for route in routes:
+        route_id = get_route_id(route)
+        result = results[route_id]
+        origin_city = get_city_name_with_code(route["origin"], airports)
+        destination_city = get_city_name_with_code(route["destination"], airports)
+
+        if result is None:
+            pending_msgs.append(
+                f"⚠️ Не удалось получить цену для <b>{origin_city} → {destination_city}</b> "
+                f"на {route['depart_date']}"
             )
-
-            if result is None:
-                send_telegram(
-                    f"⚠️ Не удалось получить цену для <b>{origin_city} → {destination_city}</b> "
-                    f"на {route['depart_date']}"
+        else:
+            price, currency = result
+            old_price_data = prev_prices.get(route_id)
+            cur_prices[route_id] = {"price": price, "currency": currency}
+
+            if old_price_data is None or abs(price - old_price_data["price"]) > 0.01:
+                old_price = old_price_data["price"] if old_price_data else None
+                old_currency = old_price_data["currency"] if old_price_data else None
+
+                arrow = "⬆️" if old_price and price > old_price else "⬇️"
+                msg = (
+                    f"{arrow} <b>{origin_city} → {destination_city}</b>\n"
+                    f"Дата вылета: <b>{route['depart_date']}</b>\n"
+                    f"Цена: <b>{format_price(price, currency)}</b>\n"
+                    f"Старое: <b>{format_price(old_price, old_currency) if old_price else '–'}</b>"
                 )
+                pending_msgs.append(msg)
+                any_changes = True
             else:
-                price, currency = result
-                old_price_data = prev_prices.get(route_id)
-                cur_prices[route_id] = {"price": price, "currency": currency}
-
-                if old_price_data is None or abs(price - old_price_data["price"]) > 0.01:
-                    old_price = old_price_data["price"] if old_price_data else None
-                    old_currency = old_price_data["currency"] if old_price_data else None
-
-                    arrow = "⬆️" if old_price and price > old_price else "⬇️"
-                    msg = (
-                        f"{arrow} <b>{origin_city} → {destination_city}</b>\n"
-                        f"Дата вылета: <b>{route['depart_date']}</b>\n"
-                        f"Цена: <b>{format_price(price, currency)}</b>\n"
-                        f"Старое: <b>{format_price(old_price, old_currency) if old_price else '–'}</b>"
-                    )
-                    send_telegram(msg)
-                    any_changes = True
-                else:
-                    logging.info(f"🔹 Цена не изменилась для {origin_city} → {destination_city}")
+                logging.info(f"🔹 Цена не изменилась для {origin_city} → {destination_city}")
 
-            time.sleep(ROUTE_DELAY_SECONDS)
+    # Все уведомления цикла уходят одним (или несколькими, если не влезают) сообщениями
+    for chunk in split_messages(pending_msgs):
+        await asyncio.to_thread(send_telegram, chunk)
 
+    if cur_prices != prev_prices:
         save_prev_prices(cur_prices)
 
-        if not any_changes:
-            logging.info("✅ Изменений цен нет")
+    if not any_changes:
+        logging.info("✅ Изменений цен нет")
 
-        logging.info(f"⏳ Следующая проверка через {CHECK_INTERVAL_MINUTES} минут\n")
-        time.sleep(CHECK_INTERVAL_MINUTES * 60)
+async def main_loop():
+    """Основной цикл мониторинга."""
+    logging.info("🚀 Старт мониторинга маршрутов Wizzair")
+    interval = CHECK_INTERVAL_MINUTES * 60
+    # HTTP/2: параллельные запросы farechart мультиплексируются в одном TLS-соединении
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=FARECHART_TIMEOUT_SECONDS,
+        headers=WIZZAIR_HEADERS,
+        limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+    ) as client:
+        # Циклы запускаются по расписанию от момента старта, а не через interval после окончания
+        # предыдущего, поэтому время самой проверки не накапливается.
+        next_tick = time.monotonic()
+        while True:
+            await run_cycle(client)
+
+            next_tick += interval
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                logging.info(f"⏳ Следующая проверка через {sleep_for / 60:.1f} минут\n")
+                await asyncio.sleep(sleep_for)
+            else:
+                # Цикл длился дольше интервала: начинаем следующий сразу и отсчитываем расписание заново
+                logging.warning(f"Цикл проверки занял больше {CHECK_INTERVAL_MINUTES} минут, следующая проверка сразу\n")
+                next_tick = time.monotonic()
 
 if __name__ == "__main__":
-    main_loop()
+    asyncio.run(main_loop())